@@ -3,11 +3,38 @@
 Bpod Port Event Monitor - Real-time using loop_handler()
 """
 
-import queue
 import time
+from collections import deque
+
+from pybpodapi.bpod.hardware.events import EventName
 from pybpodapi.protocol import Bpod
 from pybpodapi.state_machine import StateMachine
 
+# Upper bound on buffered events; oldest events are dropped on overflow
+EVENT_QUEUE_MAXLEN = 4096
+
+# Timer events (Tup, GlobalTimerN_Start/End) are not reported as port events
+_TIMER_EVENT_NAMES = frozenset(
+    name for name in vars(EventName) if 'Tup' in name or 'Timer' in name
+)
+
+# Single monitoring state: loops back on all events, exits on timer
+_MONITOR_TRANSITIONS = {
+    'Tup': 'exit',  # Exit when timer expires
+    # Loop back to Monitor state on any port event
+    'Port1In': 'Monitor', 'Port1Out': 'Monitor',
+    'Port2In': 'Monitor', 'Port2Out': 'Monitor',
+    'Port3In': 'Monitor', 'Port3Out': 'Monitor',
+    'Port4In': 'Monitor', 'Port4Out': 'Monitor',
+    'Port5In': 'Monitor', 'Port5Out': 'Monitor',
+    'Port6In': 'Monitor', 'Port6Out': 'Monitor',
+    'Port7In': 'Monitor', 'Port7Out': 'Monitor',
+    'Port8In': 'Monitor', 'Port8Out': 'Monitor',
+    # Add BNC events
+    'BNC1High': 'Monitor', 'BNC1Low': 'Monitor',
+    'BNC2High': 'Monitor', 'BNC2Low': 'Monitor',
+}
+
 
 class RealTimeBpodMonitor(Bpod):
     """
@@ -25,7 +52,7 @@ class RealTimeBpodMonitor(Bpod):
         """
         super().__init__(serial_port=serial_port)
         self.event_callback = event_callback
-        self.event_queue = queue.Queue()
+        self.event_queue = deque(maxlen=EVENT_QUEUE_MAXLEN)
         self.is_monitoring = False
         self._last_event_count = 0
 
@@ -38,22 +65,29 @@ class RealTimeBpodMonitor(Bpod):
         """
         if not self.is_monitoring:
             return
-            
-        # Check if we have a current trial with events
-        if hasattr(self.session, 'current_trial') and self.session.current_trial:
-            current_trial = self.session.current_trial
-            
-            # Check if new events have been added since last check
-            current_event_count = len(current_trial.events_occurrences)
-            
-            if current_event_count > self._last_event_count:
-                # New events detected! Process them immediately
-                new_events = current_trial.events_occurrences[self._last_event_count:]
-                
-                for event_obj in new_events:
-                    self._process_realtime_event(event_obj)
-                    
-                self._last_event_count = current_event_count
+
+        # The session holds the trial of the state machine now running
+        current_trial = getattr(self.session, 'current_trial', None)
+        if not current_trial:
+            return
+        events = current_trial.events_occurrences
+
+        # Check if new events have been added since last check
+        last_count = self._last_event_count
+        current_event_count = len(events)
+        if current_event_count <= last_count:
+            return
+
+        # Mark events as seen first so a failing event is not reprocessed
+        self._last_event_count = current_event_count
+
+        # New events detected! Process them immediately
+        process_event = self._process_realtime_event
+        for event_obj in events[last_count:current_event_count]:
+            try:
+                process_event(event_obj)
+            except Exception as e:
+                print(f"❌ Error processing real-time event: {e}")
 
     def _process_realtime_event(self, event_obj):
         """
@@ -62,28 +96,24 @@ class RealTimeBpodMonitor(Bpod):
         Args:
             event_obj: EventOccurrence object from Bpod
         """
-        try:
-            # Extract event information
-            event_name = str(event_obj.event_name)
-
-            # Skip timer events (Tup events)
-            if 'Tup' in event_name or 'Timer' in event_name:
-                return
+        # Extract event information
+        event_name = event_obj.event_name
 
-            print(f"🔔 REAL-TIME EVENT: {event_name} at {time.time():.3f}")
+        # Skip timer events (Tup events)
+        if event_name in _TIMER_EVENT_NAMES:
+            return
 
-            # Add to queue for main thread access
-            self.event_queue.put(event_name)
+        print(f"🔔 REAL-TIME EVENT: {event_name} at {time.time():.3f}")
 
-            # Call user callback if provided
-            if self.event_callback:
-                try:
-                    self.event_callback(event_name)
-                except Exception as e:
-                    print(f"❌ Error in event callback: {e}")
+        # Add to queue for main thread access
+        self.event_queue.append(event_name)
 
-        except Exception as e:
-            print(f"❌ Error processing real-time event: {e}")
+        # Call user callback if provided
+        if self.event_callback:
+            try:
+                self.event_callback(event_name)
+            except Exception as e:
+                print(f"❌ Error in event callback: {e}")
 
     def start_monitoring(self, duration=None):
         """
@@ -114,21 +144,7 @@ class RealTimeBpodMonitor(Bpod):
         sma.add_state(
             state_name='Monitor',
             state_timer=timer_duration,  # Long monitoring period
-            state_change_conditions={
-                'Tup': 'exit',  # Exit when timer expires
-                # Loop back to Monitor state on any port event
-                'Port1In': 'Monitor', 'Port1Out': 'Monitor',
-                'Port2In': 'Monitor', 'Port2Out': 'Monitor', 
-                'Port3In': 'Monitor', 'Port3Out': 'Monitor',
-                'Port4In': 'Monitor', 'Port4Out': 'Monitor',
-                'Port5In': 'Monitor', 'Port5Out': 'Monitor',
-                'Port6In': 'Monitor', 'Port6Out': 'Monitor',
-                'Port7In': 'Monitor', 'Port7Out': 'Monitor',
-                'Port8In': 'Monitor', 'Port8Out': 'Monitor',
-                # Add BNC events
-                'BNC1High': 'Monitor', 'BNC1Low': 'Monitor',
-                'BNC2High': 'Monitor', 'BNC2Low': 'Monitor',
-            },
+            state_change_conditions=_MONITOR_TRANSITIONS,
             output_actions=[]
         )
 
@@ -159,16 +175,16 @@ class RealTimeBpodMonitor(Bpod):
         Returns:
             List of event names
         """
-        events = []
-        count = 0
-
-        while not self.event_queue.empty():
-            if max_events and count >= max_events:
-                break
-            events.append(self.event_queue.get_nowait())
-            count += 1
-
-        return events
+        # Pop exactly the events present now; events appended concurrently
+        # by loop_handler stay queued for the next call
+        n_events = len(self.event_queue)
+        if max_events:
+            n_events = min(max_events, n_events)
+        if not n_events:
+            return []
+
+        popleft = self.event_queue.popleft
+        return [popleft() for _ in range(n_events)]
 
     def __enter__(self):
         """Context manager entry."""
@@ -15,11 +15,14 @@ Features:
 - Configurable through EthoPy's setup configuration system
 """
 
+import ast
 import logging
 import os
+import queue
+import re
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Dict, Optional, Tuple
 
 from ethopy import local_conf
@@ -37,6 +40,93 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+# Timer events (Tup, GlobalTimerN_Start/End) do not map to EthoPy ports
+_TIMER_EVENT_NAMES = (
+    frozenset(name for name in vars(EventName) if "Tup" in name or "Timer" in name)
+    if IMPORT_BPOD
+    else frozenset()
+)
+
+_IO_EVENT_RE = re.compile(r"^(Port|BNC|Wire)(\d+)(In|Out|High|Low)$")
+
+
+def _parse_io_events(names) -> Dict[str, Tuple[str, int, str]]:
+    """Map I/O event names to (kind, number, direction), e.g. Port10In -> (Port, 10, In)."""
+    parsed = {}
+    for name in names:
+        match = _IO_EVENT_RE.match(name)
+        if match:
+            kind, num, direction = match.groups()
+            parsed[name] = (kind, int(num), direction)
+    return parsed
+
+
+# Parsed once at import so the event path is a single dict lookup
+_IO_EVENTS = _parse_io_events(vars(EventName)) if IMPORT_BPOD else {}
+
+# Monitoring trials stay resident on the Bpod this long (s); they are ended
+# early with stop_trial() whenever the host needs the state machine
+MONITOR_TRIAL_DURATION = 3600
+
+# Transitions of the monitoring state, shared by every monitor state machine
+_MONITOR_TRANSITIONS = {}
+if IMPORT_BPOD:
+    _MONITOR_TRANSITIONS = {
+        EventName.Tup: "exit",  # End the trial on timeout; the loop starts another
+        # Port events
+        EventName.Port1In: "Monitor",
+        EventName.Port1Out: "Monitor",
+        EventName.Port2In: "Monitor",
+        EventName.Port2Out: "Monitor",
+        EventName.Port3In: "Monitor",
+        EventName.Port3Out: "Monitor",
+        EventName.Port4In: "Monitor",
+        EventName.Port4Out: "Monitor",
+        EventName.Port5In: "Monitor",
+        EventName.Port5Out: "Monitor",
+        EventName.Port6In: "Monitor",
+        EventName.Port6Out: "Monitor",
+        EventName.Port7In: "Monitor",
+        EventName.Port7Out: "Monitor",
+        EventName.Port8In: "Monitor",
+        EventName.Port8Out: "Monitor",
+        # # BNC events
+        # EventName.BNC1High: "Monitor",
+        # EventName.BNC1Low: "Monitor",
+        # EventName.BNC2High: "Monitor",
+        # EventName.BNC2Low: "Monitor",
+        # # Wire events
+        # EventName.Wire1High: "Monitor",
+        # EventName.Wire1Low: "Monitor",
+        # EventName.Wire2High: "Monitor",
+        # EventName.Wire2Low: "Monitor",
+    }
+
+
+def _env_literal(name: str, default: str):
+    """Parse a Python literal (e.g. a list of bools) from an environment variable."""
+    value = os.environ.get(name, default)
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        log.warning(f"⚠️ Invalid {name}={value!r}, using {default}")
+        return ast.literal_eval(default)
+
+
+class _EventState:
+    """Event-path bookkeeping, slotted for fixed-offset attribute access."""
+
+    __slots__ = ("last_count", "stop_sent", "last_lick", "debounce_s")
+
+    def __init__(self, debounce_s: float):
+        # Events of the current trial already processed by loop_handler
+        self.last_count = 0
+        # Whether loop_handler already ended the current monitoring trial
+        self.stop_sent = False
+        # Lick debouncing: Bpod time of the last accepted In edge per port
+        self.last_lick: Dict[int, float] = {}
+        self.debounce_s = debounce_s
+
 
 class BpodPorts(Interface, Bpod):
     """
@@ -46,6 +136,9 @@ class BpodPorts(Interface, Bpod):
     providing non-blocking event detection and stimulus delivery.
     """
 
+    # pybpod settings are module-global, so they are configured only once
+    _settings_configured = False
+
     def __init__(self, **kwargs):
         """
         Initialize Bpod interface.
@@ -69,6 +162,9 @@ class BpodPorts(Interface, Bpod):
         Interface.__init__(self, **kwargs)
         Bpod.__init__(self)
 
+        # Index configured ports by (type, port) for per-event lookups
+        self._build_port_index()
+
         # Log connection info if Bpod initialized successfully
         if hasattr(self, "serial_port"):
             log.info(f"Connected to Bpod on {self.serial_port}")
@@ -80,11 +176,27 @@ class BpodPorts(Interface, Bpod):
         # Event detection setup
         self.is_monitoring = False
         self.monitor_thread = None
-        self._last_event_count = 0
+        debounce_ms = local_conf.get("BPOD_EVENT_DEBOUNCE_MS", 2)
+        self._events = _EventState(debounce_s=debounce_ms / 1000.0)
+        # pybpodapi only fills in an event's host_timestamp during a trial when
+        # live timestamps are on; otherwise it arrives when the trial ends
+        hardware = getattr(self, "hardware", None)
+        self._live_timestamps = bool(getattr(hardware, "live_timestamps", False))
+        if not self._live_timestamps:
+            log.warning(
+                "Bpod live timestamps are off: lick debouncing uses host time "
+                "when each event is processed"
+            )
 
         # State machine synchronization
         self._state_machine_lock = threading.Lock()
-        self._monitoring_paused = False
+        # Set while monitoring may run; cleared to pause it (e.g. liquid delivery)
+        self._run_event = threading.Event()
+        self._run_event.set()
+        # Whether the monitor state machine is the one currently on the Bpod
+        self._monitor_sma_loaded = False
+        # Whether a monitoring trial is currently running on the Bpod
+        self._monitor_running = False
 
         self.ready = False
         self.response = None
@@ -92,17 +204,36 @@ class BpodPorts(Interface, Bpod):
         self.position = None
         self.position_tmst = None
 
-        # Thread pool for stimulus delivery
-        self.thread = ThreadPoolExecutor(max_workers=4)
+        # Single worker for liquid delivery; deliveries are serialized by
+        # the state machine lock, so more workers would only contend for it
+        self._liquid_queue = queue.Queue(maxsize=32)
+        # Rewards that could not be queued and were not given
+        self.missed_rewards = 0
+        self._liquid_worker = threading.Thread(
+            target=self._liquid_loop, daemon=True, name="BpodLiquidDelivery"
+        )
+        self._liquid_worker.start()
 
         # Start background event monitoring
         self.start_monitoring()
 
+    def _build_port_index(self):
+        """Build the (type, port) -> Port lookup used on the event path."""
+        self._port_index = {(p.type, p.port): p for p in self.ports}
+        self._lick_ports = {p.port for p in self.ports if p.type == "Lick"}
+        # Activity record templates, copied and filled in per event
+        self._port_records = {
+            key: dict(p.__dict__) for key, p in self._port_index.items()
+        }
+
     def _configure_pybpod_settings(self):
         """
         Configure pybpod module settings using environment variables and EthoPy config.
         This eliminates the need for a separate user_settings.py file.
         """
+        if BpodPorts._settings_configured:
+            return
+
         try:
             # 🔌 ESSENTIAL: Serial port configuration
             serial_port = (
@@ -115,27 +246,18 @@ class BpodPorts(Interface, Bpod):
 
             # 🎯 PORT ENABLEMENT: Which hardware ports are active
             # BNC ports (typically 2): for external triggers, sync signals
-            bnc_ports = os.environ.get("BPOD_BNC_PORTS_ENABLED", "[True, True]")
-            pybpod_settings.BPOD_BNC_PORTS_ENABLED = (
-                eval(bnc_ports) if isinstance(bnc_ports, str) else bnc_ports
+            pybpod_settings.BPOD_BNC_PORTS_ENABLED = _env_literal(
+                "BPOD_BNC_PORTS_ENABLED", "[True, True]"
             )
-
             # Wire ports (typically 2-4): for direct digital I/O
-            wire_ports = os.environ.get("BPOD_WIRED_PORTS_ENABLED", "[True, True]")
-            pybpod_settings.BPOD_WIRED_PORTS_ENABLED = (
-                eval(wire_ports) if isinstance(wire_ports, str) else wire_ports
+            pybpod_settings.BPOD_WIRED_PORTS_ENABLED = _env_literal(
+                "BPOD_WIRED_PORTS_ENABLED", "[True, True]"
             )
-
             # Behavior ports (typically 8): for nose pokes, lick detection
-            behavior_ports = os.environ.get(
+            pybpod_settings.BPOD_BEHAVIOR_PORTS_ENABLED = _env_literal(
                 "BPOD_BEHAVIOR_PORTS_ENABLED",
                 "[True, True, True, True, True, True, True, True]",
             )
-            pybpod_settings.BPOD_BEHAVIOR_PORTS_ENABLED = (
-                eval(behavior_ports)
-                if isinstance(behavior_ports, str)
-                else behavior_ports
-            )
 
             # ⚙️ COMMUNICATION: Serial communication settings
             pybpod_settings.PYBPOD_BAUDRATE = int(
@@ -166,6 +288,7 @@ class BpodPorts(Interface, Bpod):
                 "PYBPOD_PROJECT", "Behavioral-Experiment"
             )
 
+            BpodPorts._settings_configured = True
             log.info("✅ Pybpod settings configured successfully")
             log.debug(
                 f"   - BNC ports enabled: {pybpod_settings.BPOD_BNC_PORTS_ENABLED}"
@@ -196,90 +319,96 @@ class BpodPorts(Interface, Bpod):
 
     def _monitoring_loop(self):
         """Background monitoring loop that runs continuously"""
+        # Built once and reused for every monitoring cycle
+        monitor_sma = self._build_monitor_sma()
+
         while self.is_monitoring:
             try:
-                # Check if monitoring is paused (for liquid delivery)
-                if self._monitoring_paused:
-                    log.debug("Bpod monitoring is paused")
-                    time.sleep(0.1)
-                    continue
+                # Block while monitoring is paused (for liquid delivery)
+                self._run_event.wait()
+                if not self.is_monitoring:
+                    break
 
-                self._last_event_count = 0  # Reset for each cycle
+                self._events.last_count = 0  # Reset for each cycle
+                self._events.stop_sent = False
 
                 # Acquire lock before sending state machine
                 with self._state_machine_lock:
-                    if self._monitoring_paused:  # Double-check after acquiring lock
+                    # Double-check after acquiring lock
+                    if not self._run_event.is_set():
                         continue
 
-                    # Create state machine for event monitoring
-                    sma = StateMachine(self)
-
-                    # Create a monitoring state that loops back on all events
-                    sma.add_state(
-                        state_name="Monitor",
-                        state_timer=0.2,  # 2 second cycles
-                        state_change_conditions={
-                            EventName.Tup: "Monitor",  # Loop back on timeout
-                            # Port events
-                            EventName.Port1In: "Monitor",
-                            EventName.Port1Out: "Monitor",
-                            EventName.Port2In: "Monitor",
-                            EventName.Port2Out: "Monitor",
-                            EventName.Port3In: "Monitor",
-                            EventName.Port3Out: "Monitor",
-                            EventName.Port4In: "Monitor",
-                            EventName.Port4Out: "Monitor",
-                            EventName.Port5In: "Monitor",
-                            EventName.Port5Out: "Monitor",
-                            EventName.Port6In: "Monitor",
-                            EventName.Port6Out: "Monitor",
-                            EventName.Port7In: "Monitor",
-                            EventName.Port7Out: "Monitor",
-                            EventName.Port8In: "Monitor",
-                            EventName.Port8Out: "Monitor",
-                            # # BNC events
-                            # EventName.BNC1High: "Monitor",
-                            # EventName.BNC1Low: "Monitor",
-                            # EventName.BNC2High: "Monitor",
-                            # EventName.BNC2Low: "Monitor",
-                            # # Wire events
-                            # EventName.Wire1High: "Monitor",
-                            # EventName.Wire1Low: "Monitor",
-                            # EventName.Wire2High: "Monitor",
-                            # EventName.Wire2Low: "Monitor",
-                        },
-                        output_actions=[],
-                    )
+                    # The Bpod keeps the last state machine it received, so the
+                    # monitor is only re-sent after another one replaced it
+                    if not self._monitor_sma_loaded:
+                        self.send_state_machine(monitor_sma)
+                        self._monitor_sma_loaded = True
 
                     # Run state machine (this calls our loop_handler automatically)
-                    self.send_state_machine(sma)
-                    self.run_state_machine(sma)
+                    self._monitor_running = True
+                    try:
+                        self.run_state_machine(monitor_sma)
+                    finally:
+                        self._monitor_running = False
 
             except Exception as e:
                 log.error(f"Error in Bpod monitoring loop: {e}")
+                self._monitor_sma_loaded = False
                 time.sleep(0.5)  # Brief pause before retry
 
+    def _build_monitor_sma(self):
+        """Build the monitoring state machine that loops back on all port events."""
+        # Create state machine for event monitoring
+        sma = StateMachine(self)
+
+        # Create a long monitoring state that loops back on all events
+        sma.add_state(
+            state_name="Monitor",
+            state_timer=MONITOR_TRIAL_DURATION,
+            state_change_conditions=_MONITOR_TRANSITIONS,
+            output_actions=[],
+        )
+
+        return sma
+
     def loop_handler(self):
         """
         Real-time event capture during state machine execution.
         This method is called by Bpod during state machine execution.
         """
-        if not self.is_monitoring:
-            return
+        state = self._events
+        if not (self.is_monitoring and self._run_event.is_set()):
+            # A stop or pause can land between the loop's checks and the start
+            # of the monitoring trial, so its interrupt is skipped; end the
+            # trial from here rather than let it run for the full timer
+            if self._monitor_running and not state.stop_sent:
+                state.stop_sent = True
+                self._interrupt_monitor()
+            if not self.is_monitoring:
+                return
 
-        # Check for new events in current trial
-        if hasattr(self.session, "current_trial") and self.session.current_trial:
-            current_trial = self.session.current_trial
-            current_event_count = len(current_trial.events_occurrences)
+        # Look the trial up on every call: pybpodapi creates a new one for each
+        # state machine run, including reward deliveries
+        current_trial = getattr(self.session, "current_trial", None)
+        if not current_trial:
+            return
+        events = current_trial.events_occurrences
 
-            if current_event_count > self._last_event_count:
-                # Process new events
-                new_events = current_trial.events_occurrences[self._last_event_count :]
+        last_count = state.last_count
+        current_event_count = len(events)
+        if current_event_count <= last_count:
+            return
 
-                for event_obj in new_events:
-                    self._process_realtime_event(event_obj)
+        # Mark events as seen first so a failing event is not reprocessed
+        state.last_count = current_event_count
 
-                self._last_event_count = current_event_count
+        # Process new events; a failing event must not drop the rest of the batch
+        process_event = self._process_realtime_event
+        for event_obj in events[last_count:current_event_count]:
+            try:
+                process_event(event_obj)
+            except Exception as e:
+                log.error(f"Error processing Bpod event: {e}")
 
     def _process_realtime_event(self, event_obj):
         """
@@ -288,30 +417,34 @@ class BpodPorts(Interface, Bpod):
         Args:
             event_obj: EventOccurrence object from Bpod
         """
-        try:
-            event_name = str(event_obj.event_name)
+        event_name = event_obj.event_name
 
-            # Skip timer events
-            if "Tup" in event_name or "Timer" in event_name:
-                return
+        # Skip timer events
+        if event_name in _TIMER_EVENT_NAMES:
+            return
 
-            timestamp = time.time()
+        # Wall-clock time stored with the activity record
+        timestamp = time.time()
+        # Bpod hardware time of the event for debouncing; unlike the host clock
+        # it does not bunch up when this thread falls behind. Without live
+        # timestamps it is not known yet, so fall back to host monotonic time
+        event_time = event_obj.host_timestamp if self._live_timestamps else None
+        if event_time is None:
+            event_time = time.monotonic_ns() / 1e9
 
-            # Process event based on type for EthoPy integration
-            self._handle_ethopy_event(event_name, timestamp)
+        # Process event based on type for EthoPy integration
+        self._handle_ethopy_event(event_name, timestamp, event_time)
 
-            log.debug(f"Bpod event: {event_name} at {timestamp:.3f}")
+        log.debug(f"Bpod event: {event_name} at {timestamp:.3f}")
 
-        except Exception as e:
-            log.error(f"Error processing Bpod event: {e}")
-
-    def _handle_ethopy_event(self, event_name: str, timestamp: float):
+    def _handle_ethopy_event(self, event_name: str, timestamp: float, event_time: float):
         """
         Convert Bpod events to EthoPy port activations.
 
         Args:
             event_name: Name of the Bpod event
             timestamp: Event timestamp
+            event_time: Bpod-side event time in seconds, used for debouncing
         """
         # Validate inputs
         if not event_name:
@@ -319,23 +452,33 @@ class BpodPorts(Interface, Bpod):
             return
 
         try:
-            # Parse event name (e.g., "Port1In", "Port2Out", "BNC1High")
-            if event_name.startswith("Port") and (
-                "In" in event_name or "Out" in event_name
-            ):
-                # Extract port number
-                port_num = int(event_name[4])  # Port1In -> 1
-
-                # Find the port configuration to determine type
-                port_config = next((p for p in self.ports if p.port == port_num), None)
-                if port_config:
-                    if port_config.type == "Lick" and "In" in event_name:
-                        self._handle_lick_event(port_num, timestamp)
-                    elif port_config.type == "Proximity":
-                        # IN = entering position (active), OUT = leaving position (inactive)
-                        self._handle_proximity_event(
-                            port_num, "In" in event_name, timestamp
-                        )
+            # Look up the parsed event (e.g., "Port1In" -> ("Port", 1, "In"))
+            parsed = _IO_EVENTS.get(event_name)
+            if parsed is None:
+                return
+            kind, port_num, direction = parsed
+
+            # Only behavior port events map to EthoPy ports; BNC/Wire are ignored
+            if kind != "Port":
+                return
+
+            # Dispatch on the configured port type
+            is_in = direction == "In"
+            if port_num in self._lick_ports:
+                if not is_in:
+                    return
+                # Drop contact bounce: a lick In edge too soon after the last
+                # accepted one. A negative gap means the Bpod clock restarted
+                state = self._events
+                since_last = event_time - state.last_lick.get(port_num, float("-inf"))
+                if 0 <= since_last < state.debounce_s:
+                    return
+                state.last_lick[port_num] = event_time
+                self._handle_lick_event(port_num, timestamp)
+            elif ("Proximity", port_num) in self._port_index:
+                # IN = entering position (active), OUT = leaving position (inactive);
+                # level changes are never dropped so the state follows the beam
+                self._handle_proximity_event(port_num, is_in, timestamp)
 
         except Exception as e:
             log.error(f"Error handling EthoPy event {event_name}: {e}")
@@ -349,11 +492,7 @@ class BpodPorts(Interface, Bpod):
             timestamp: Event timestamp
         """
         # Find matching port in configuration
-        lick_port = None
-        for port in self.ports:
-            if port.type == "Lick" and port.port == port_num:
-                lick_port = port
-                break
+        lick_port = self._port_index.get(("Lick", port_num))
 
         if lick_port:
             self.response = lick_port
@@ -361,13 +500,10 @@ class BpodPorts(Interface, Bpod):
 
             # Log activity through EthoPy behavior system
             if hasattr(self, "beh") and self.beh:
-                self.beh.log_activity(
-                    {
-                        **lick_port.__dict__,
-                        "time": self.resp_tmst,
-                        "bpod_timestamp": timestamp,
-                    }
-                )
+                record = self._port_records[("Lick", port_num)].copy()
+                record["time"] = self.resp_tmst
+                record["bpod_timestamp"] = timestamp
+                self.beh.log_activity(record)
 
             log.debug(f"🐭 Lick detected on port {port_num}")
 
@@ -381,11 +517,7 @@ class BpodPorts(Interface, Bpod):
             timestamp: Event timestamp
         """
         # Find matching proximity port
-        prox_port = None
-        for port in self.ports:
-            if port.type == "Proximity" and port.port == sensor_num:
-                prox_port = port
-                break
+        prox_port = self._port_index.get(("Proximity", sensor_num))
 
         if prox_port:
             if active and not self.ready:
@@ -393,43 +525,67 @@ class BpodPorts(Interface, Bpod):
                 self.timer_ready.start()
                 self.ready = True
                 self.position = prox_port
-                self.position_tmst = self.beh.log_activity(
-                    {
-                        **prox_port.__dict__,
-                        "in_position": 1,
-                        "bpod_timestamp": timestamp,
-                    }
-                )
+                record = self._port_records[("Proximity", sensor_num)].copy()
+                record["in_position"] = 1
+                record["bpod_timestamp"] = timestamp
+                self.position_tmst = self.beh.log_activity(record)
                 log.debug(f"🐭 Animal in position (sensor {sensor_num})")
 
             elif not active and self.ready:
                 # Animal left position
                 self.ready = False
-                tmst = self.beh.log_activity(
-                    {
-                        **prox_port.__dict__,
-                        "in_position": 0,
-                        "bpod_timestamp": timestamp,
-                    }
-                )
+                record = self._port_records[("Proximity", sensor_num)].copy()
+                record["in_position"] = 0
+                record["bpod_timestamp"] = timestamp
+                tmst = self.beh.log_activity(record)
                 self.position_dur = tmst - self.position_tmst
                 log.debug(f"🐭 Animal left position (sensor {sensor_num})")
 
+    def _interrupt_monitor(self):
+        """End the running monitoring trial early so the Bpod is free."""
+        if self._monitor_running:
+            try:
+                self.stop_trial()
+            except Exception as e:
+                log.warning(f"Could not interrupt Bpod monitoring trial: {e}")
+
+    @contextmanager
+    def _exclusive_state_machine(self):
+        """Hold the state machine lock, interrupting monitoring until it is free."""
+        # Retry the interrupt in case it raced with the start of a monitoring trial
+        while not self._state_machine_lock.acquire(timeout=0.5):
+            self._interrupt_monitor()
+        try:
+            yield
+        finally:
+            self._state_machine_lock.release()
+
     def pause_monitoring(self):
         """Temporarily pause monitoring for state machine operations"""
-        self._monitoring_paused = True
+        self._run_event.clear()
+        self._interrupt_monitor()
         log.debug("Bpod monitoring paused")
 
     def resume_monitoring(self):
         """Resume monitoring after state machine operations"""
-        self._monitoring_paused = False
+        self._run_event.set()
         log.debug("Bpod monitoring resumed")
 
     def stop_monitoring(self):
         """Stop background event monitoring"""
         self.is_monitoring = False
-        if self.monitor_thread and self.monitor_thread.is_alive():
-            self.monitor_thread.join(timeout=3.0)
+        # Wake the loop if it is paused and end any running trial so it exits now
+        self._run_event.set()
+        # Retry the interrupt until the loop exits, in case it raced with the
+        # start of a monitoring trial
+        thread = self.monitor_thread
+        if thread:
+            deadline = time.monotonic() + 3.0
+            while thread.is_alive() and time.monotonic() < deadline:
+                self._interrupt_monitor()
+                thread.join(timeout=0.5)
+            if thread.is_alive():
+                log.warning("Bpod monitoring thread did not stop")
         log.info("Bpod event monitoring stopped")
 
     def give_liquid(self, port: int, duration: Optional[float] = None):
@@ -439,9 +595,30 @@ class BpodPorts(Interface, Bpod):
         Args:
             port: Port number for delivery
             duration: Duration in milliseconds (uses calibrated value if None)
-        """
 
-        self.thread.submit(self._deliver_liquid, port, duration)
+        Returns:
+            True if the reward was queued, False if it was not given
+        """
+        # Called from the state machine thread, so never block or raise here; a
+        # full queue means deliveries are stuck on the Bpod
+        try:
+            self._liquid_queue.put_nowait((port, duration))
+        except queue.Full:
+            self.missed_rewards += 1
+            log.error(
+                f"Liquid delivery queue full, reward on port {port} not given "
+                f"({self.missed_rewards} missed this session)"
+            )
+            return False
+        return True
+
+    def _liquid_loop(self):
+        """Worker loop delivering queued liquid rewards until a None sentinel."""
+        while True:
+            request = self._liquid_queue.get()
+            if request is None:
+                break
+            self._deliver_liquid(*request)
 
     def _deliver_liquid(self, port: int, duration: float):
         """
@@ -461,7 +638,10 @@ class BpodPorts(Interface, Bpod):
 
         try:
             # Wait for monitoring to actually pause and acquire lock
-            with self._state_machine_lock:
+            with self._exclusive_state_machine():
+                # Replaces the monitor state machine on the Bpod
+                self._monitor_sma_loaded = False
+
                 # Create liquid delivery state machine
                 sma = StateMachine(self)
 
@@ -537,21 +717,39 @@ class BpodPorts(Interface, Bpod):
         try:
             self.stop_monitoring()
 
+            # Let pending deliveries finish before closing the connection, but
+            # do not hang shutdown if the Bpod is stuck
+            try:
+                self._liquid_queue.put(None, timeout=1.0)
+            except queue.Full:
+                log.warning("Liquid delivery queue full, pending rewards are dropped")
+            self._liquid_worker.join(timeout=5.0)
+            if self._liquid_worker.is_alive():
+                log.warning("Liquid delivery worker still running, closing Bpod anyway")
+
             # Close Bpod connection
             self.close()
 
-            # Shutdown thread pool
-            self.thread.shutdown(wait=True)
-
             log.info("Bpod interface cleaned up successfully")
 
         except Exception as e:
             log.error(f"Error during Bpod cleanup: {e}")
 
-    def load_calibration(self):
-        """Load port calibration data from database"""
+    def load_calibration(self, reload: bool = True):
+        """
+        Load port calibration data from database.
+
+        Args:
+            reload: Reload even if calibration is already loaded, so that a
+                recalibration written to the database is picked up
+        """
+        # May run before BpodPorts.__init__ sets its own attributes
+        if not reload and getattr(self, "_calibration_loaded", False):
+            return
+
         # Use parent class calibration loading
         super().load_calibration()
+        self._calibration_loaded = True
         log.info("Bpod calibration data loaded")
 
     def calc_pulse_dur(self, reward_amount: float) -> Dict[int, float]:
@@ -564,5 +762,8 @@ class BpodPorts(Interface, Bpod):
         Returns:
             Dictionary of actual reward amounts by port
         """
+        # Calibration is needed here; only load it if nothing has loaded it yet
+        self.load_calibration(reload=False)
+
         # Use parent class calculation or provide Bpod-specific implementation
         return super().calc_pulse_dur(reward_amount)
@@ -1,5 +1,9 @@
 import multiprocessing as mp
+import os
 import time
+import uuid
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
 from typing import Dict, List, Optional, Tuple, Union
 
 import datajoint as dj
@@ -10,6 +14,79 @@ from ethopy.core.logger import interface
 from ethopy.interfaces.dlc import DLCContinuousPoseEstimator, DLCCornerDetector
 from ethopy.utils.helper_functions import shared_memory_array
 
+try:
+    from numba import njit
+
+    IMPORT_NUMBA = True
+except ImportError:
+    IMPORT_NUMBA = False
+
+
+def _first_in_radius(locs_xy: np.ndarray, tx: float, ty: float, r2: float) -> int:
+    """Return the index of the first (N, 2) location within sqrt(r2) of (tx, ty), or -1."""
+    for i in range(locs_xy.shape[0]):
+        dx = locs_xy[i, 0] - tx
+        dy = locs_xy[i, 1] - ty
+        if dx * dx + dy * dy <= r2:
+            return i
+    return -1
+
+
+if IMPORT_NUMBA:
+    _first_in_radius = njit(cache=True, fastmath=True)(_first_in_radius)
+
+
+class _SharedCorners:
+    """
+    Dict-like result for DLCCornerDetector backed by shared memory.
+
+    The detector process writes its results with ``update``; they are stored as
+    rows of one float64 shared memory array and ``ready`` is set once they are in.
+    """
+
+    ROWS = {"corners": slice(0, 4), "affine_matrix": slice(4, 7), "affine_matrix_inv": slice(7, 10)}
+    SHAPE = (10, 3)
+
+    def __init__(self):
+        # shared_memory_array reuses a block with the same name, so each instance gets its own
+        self._array, self._shm, _ = shared_memory_array(name=f"corners_{os.getpid()}_{uuid.uuid4().hex[:8]}",
+                                                        rows_len=self.SHAPE[0],
+                                                        columns_len=self.SHAPE[1],
+                                                        dtype="float64")
+        self.ready = mp.Event()
+
+    def __getstate__(self) -> Dict:
+        # only the block name travels to the detector process
+        return {"name": self._shm.name, "ready": self.ready}
+
+    def __setstate__(self, state: Dict) -> None:
+        # the creating process owns and unlinks the block; keep the resource tracker out of it here
+        try:
+            self._shm = SharedMemory(name=state["name"], track=False)
+        except TypeError:  # Python < 3.13
+            self._shm = SharedMemory(name=state["name"])
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        self._array = np.ndarray(self.SHAPE, dtype=np.float64, buffer=self._shm.buf)
+        self.ready = state["ready"]
+
+    def update(self, values: Dict) -> None:
+        for key, value in values.items():
+            if key in self.ROWS:
+                self._array[self.ROWS[key]] = value
+        self.ready.set()
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self._array[self.ROWS[key]].copy()
+
+    def release(self) -> None:
+        """Close and unlink the shared memory block."""
+        self._array = None
+        try:
+            self._shm.close()
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
 
 @behavior.schema
 class OpenField(Behavior, dj.Manual):
@@ -80,24 +157,31 @@ class OpenField(Behavior, dj.Manual):
 
         self.default_key = {"reward_type": "water", "response_port": 1, "reward_port": 1}
 
-        # create a queue that returns the arena corners
-        self.manager = mp.Manager()
-
         # Create shared memory array for pose
         self.pose, self.sm, self.shm_conf = shared_memory_array(name="pose",
                                                                 rows_len=self.SHARED_MEMORY_SHAPE[0],
                                                                 columns_len=self.SHARED_MEMORY_SHAPE[1],
                                                                 )
+        # persistent view of the latest pose row (tmst, x, y, angle) in shared memory
+        self._pose_view = self.pose[0]
 
         self.response_locs: List[Tuple[float, float]] = []
         self._responded_loc: Tuple[float, float] = []
         self.reward_locs: List[Tuple[float, float]] = []
+        self._reward_locs_set: frozenset = frozenset()
         self.init_loc: List[Tuple[float, float]] = ()
+        self.response_locs_np = np.empty((0, 2))
+        self.reward_locs_np = np.empty((0, 2))
+        self.init_loc_np = np.empty((0, 2))
         self.position_tmst = 0
         self.response_loc: Optional[Tuple[float, float]] = None
 
         # To be set during setup
+        self._arena_conf: Dict = {}
         self.screen_pos: Optional[np.ndarray] = None
+        self._dim_change: int = 0
+        self._sign: float = 1.0
+        self._fixed_coord: float = 0.0
         self.dlc_model_path: str = ""
         self.dlc: Optional[DLCContinuousPoseEstimator] = None
 
@@ -117,17 +201,9 @@ class OpenField(Behavior, dj.Manual):
         super().setup(exp)
         setup_conf_idx = exp.session_params['setup_conf_idx']
         self.logger.log_setup_confs(self.conf_tables, setup_conf_idx)
-        self.Arena_params = self.logger.get(schema='interface',
-                                            table='SetupConfigurationArena',
-                                            key={'setup_conf_idx': setup_conf_idx},
-                                            as_dict=True
-                                            )[0]
-
-        self.Arena_Screens_pos = self.logger.get(schema='interface',
-                                                 table='SetupConfigurationArena.Screen',
-                                                 key={'setup_conf_idx': setup_conf_idx},
-                                                 as_dict=True,
-                                                 )[0]
+        self._arena_conf = self._get_arena_conf(setup_conf_idx)
+        self.Arena_params = self._arena_conf["arena"]
+        self.Arena_Screens_pos = self._arena_conf["screen"]
 
         self.arena_size = self.Arena_params['size']
 
@@ -136,18 +212,54 @@ class OpenField(Behavior, dj.Manual):
              [self.Arena_Screens_pos['stop_x'], self.Arena_Screens_pos['stop_y']]]
         )
 
+        # in a square positions of the screen only one dimension is change
+        diff_screen_pos = self.screen_pos[0] - self.screen_pos[1]
+        self._dim_change = int(np.nonzero(diff_screen_pos)[0][0])
+        self._sign = -1.0 if diff_screen_pos[self._dim_change] >= 0 else 1.0
+        self._fixed_coord = float(self.screen_pos[0, 1 - self._dim_change])
+
+        if IMPORT_NUMBA:
+            # compile the location kernel now rather than on the first frame
+            _first_in_radius(np.zeros((1, 2)), 0.0, 0.0, 0.0)
+
         self._initialize_dlc()
 
+    def _get_arena_conf(self, setup_conf_idx: int) -> Dict:
+        """
+        Fetch the arena configuration of a setup.
+
+        Args:
+            setup_conf_idx: The setup configuration index.
+
+        Returns:
+            A dict with the arena and screen rows and the model path per target.
+        """
+        key = {'setup_conf_idx': setup_conf_idx}
+        models: Dict[str, str] = {}
+        # one fetch serves both the bodyparts and the corners model
+        for model in self.logger.get(schema='interface',
+                                     table='SetupConfigurationArena.Models',
+                                     key=key,
+                                     as_dict=True):
+            models.setdefault(model['target'], model['path'])
+        return {
+            "arena": self.logger.get(schema='interface',
+                                     table='SetupConfigurationArena',
+                                     key=key,
+                                     as_dict=True)[0],
+            "screen": self.logger.get(schema='interface',
+                                      table='SetupConfigurationArena.Screen',
+                                      key=key,
+                                      as_dict=True)[0],
+            "models": models,
+        }
+
     def _initialize_dlc(self) -> None:
         """Initialize the DeepLabCut (DLC) object for pose estimation."""
         if self.interface.camera is None:
             raise ValueError("Camera is not initialized")
         corners, affine_matrix = self.get_corners()
-        dlc_body_path = self.logger.get(schema='interface',
-                                               table='SetupConfigurationArena.Models',
-                                               fields=['path'],
-                                               key={'setup_conf_idx': self.exp.session_params['setup_conf_idx'],
-                                                    'target': 'bodyparts'})[0]
+        dlc_body_path = self._arena_conf["models"]["bodyparts"]
         self.dlc = DLCContinuousPoseEstimator(frame_queue=self.interface.camera.process_queue,
                                               model_path=dlc_body_path,
                                               logger=self.logger,
@@ -165,18 +277,29 @@ class OpenField(Behavior, dj.Manual):
         super().prepare(condition)
         self.position_tmst = 0
 
-        # find real position of the objects
-        self.response_locs = self.screen_pos_to_real_pos(
+        # find real position of the objects as (N, 2) float64 arrays that
+        # in_location can use on every frame as-is
+        self.response_locs_np = self.screen_pos_to_real_pos(
             self.curr_cond["response_loc_x"], const_dim=self.arena_size
         )
-        self.reward_locs = self.screen_pos_to_real_pos(
+        self.reward_locs_np = self.screen_pos_to_real_pos(
             self.curr_cond["reward_loc_x"], const_dim=self.arena_size
         )
+        self.init_loc_np = np.array(
+            [[self.curr_cond["init_loc_x"], self.curr_cond["init_loc_y"]]], dtype=np.float64
+        )
 
+        self.response_locs = self.response_locs_np.tolist()
+        self.reward_locs = self.reward_locs_np.tolist()
         self.init_loc = [
             (self.curr_cond["init_loc_x"], self.curr_cond["init_loc_y"]),
         ]
 
+        # rounded so that float noise does not break the membership test in is_correct
+        self._reward_locs_set = frozenset(
+            (round(x, 6), round(y, 6)) for x, y in self.reward_locs
+        )
+
     def log_loc_activity(self, in_pos: int, response_loc: Tuple[float, float]) -> None:
         """
         Log the animal's location activity.
@@ -200,7 +323,7 @@ class OpenField(Behavior, dj.Manual):
     def position_in_radius(
         self,
         target_position: Tuple[float, float],
-        positions: List[Tuple[float, float]],
+        positions: Union[np.ndarray, List[Tuple[float, float]]],
         radius: float,
     ) -> Optional[Tuple[float, float]]:
         """
@@ -208,27 +331,53 @@ class OpenField(Behavior, dj.Manual):
 
         Args:
             target_position: Tuple of (x, y) coordinates of the target position.
-            positions: List of tuples of (x, y) coordinates to check against.
+            positions: (N, 2) array or list of tuples of (x, y) coordinates to check against.
             radius: The radius within which to check for proximity.
 
         Returns:
             The position within the radius if found, None otherwise.
         """
-        positions_array = np.array(positions)
-        if positions_array.ndim == 1:
-            positions_array = positions_array.reshape(-1, 1)
-        distances = np.linalg.norm(positions_array - np.array(target_position), axis=1)
-        indices_within_radius = np.where(distances <= radius)[0]
+        tx, ty = target_position
+        # compare squared distances to avoid the sqrt
+        r2 = radius * radius
+
+        # a single location (the init position) needs no array work at all
+        if len(positions) == 1:
+            px, py = positions[0]
+            dx, dy = px - tx, py - ty
+            return (float(px), float(py)) if dx * dx + dy * dy <= r2 else None
+
+        if IMPORT_NUMBA:
+            # the (N, 2) float64 arrays set in prepare go to the kernel as they are
+            if not (isinstance(positions, np.ndarray) and positions.dtype == np.float64):
+                positions = np.asarray(positions, dtype=np.float64)
+            idx = _first_in_radius(positions, float(tx), float(ty), r2)
+            return tuple(positions[idx].tolist()) if idx >= 0 else None
+
+        # for a few locations a plain loop is cheaper than NumPy dispatch
+        if len(positions) <= 8:
+            if isinstance(positions, np.ndarray):
+                positions = positions.tolist()
+            for position in positions:
+                dx, dy = position[0] - tx, position[1] - ty
+                if dx * dx + dy * dy <= r2:
+                    return tuple(position)
+            return None
+
+        positions_array = np.asarray(positions, dtype=np.float64)
+        dx = positions_array[:, 0] - tx
+        dy = positions_array[:, 1] - ty
+        indices_within_radius = np.flatnonzero(dx * dx + dy * dy <= r2)
 
         return (
-            positions[indices_within_radius[0]]
+            tuple(positions_array[indices_within_radius[0]].tolist())
             if indices_within_radius.size > 0
             else None
         )
 
     def in_location(
         self,
-        locs: List[Tuple[float, float]],
+        locs: Union[np.ndarray, List[Tuple[float, float]]],
         duration: float,
         radius: float = 0.0,
         log_act: bool = True,
@@ -237,7 +386,8 @@ class OpenField(Behavior, dj.Manual):
         Check if the animal is in a location within a radius for a specified duration.
 
         Args:
-            locs: List of tuples of (x, y) coordinates to check.
+            locs: (N, 2) float64 array of (x, y) coordinates to check, e.g. the
+                response_locs_np/init_loc_np arrays set in prepare.
             duration: The duration the animal needs to stay in the location.
             radius: The radius around the location to consider.
             log_act: Whether to log the activity.
@@ -245,14 +395,18 @@ class OpenField(Behavior, dj.Manual):
         Returns:
             The response location if the animal is in position, 0 otherwise.
         """
-        self.tmst_cur, self.x_cur, self.y_cur, self.angle_cur = self.pose[0]
+        # read the whole pose sample together so a later log pairs it correctly
+        pose = self._pose_view
+        self.tmst_cur, self.x_cur, self.y_cur, self.angle_cur = (
+            pose[0], pose[1], pose[2], pose[3]
+        )
         self.response_loc = self.position_in_radius(
             (self.x_cur, self.y_cur), locs, radius
         )
 
         if self.response_loc is not None:
             if self.position_tmst == 0:
-                self.position_tmst = time.time()
+                self.position_tmst = time.monotonic_ns()
                 if log_act:
                     self._responded_loc = self.response_loc
                     self.log_loc_activity(1, self.response_loc)
@@ -263,13 +417,14 @@ class OpenField(Behavior, dj.Manual):
 
         return self.response_loc if self.is_ready(duration) else 0
 
-    def is_ready(self, init_duration: float, since: float = False) -> bool:
+    def is_ready(self, init_duration: float, since: int = 0) -> bool:
         """
         Check if the specified duration has passed since entering a location.
 
         Args:
             init_duration: The duration to check against (in milliseconds).
-            since: If True, check if the position timestamp is after the 'since' time.
+            since: If set, a time.monotonic_ns() timestamp that the position
+                timestamp must be after.
 
         Returns:
             True if the duration has passed, False otherwise.
@@ -278,10 +433,11 @@ class OpenField(Behavior, dj.Manual):
             return True
         if self.position_tmst == 0:
             return False
-        elapsed = time.time() - self.position_tmst
+        # position_tmst is in monotonic nanoseconds
+        elapsed_ns = time.monotonic_ns() - self.position_tmst
         if since:
-            return self.position_tmst > since and elapsed > (init_duration / 1000)
-        return elapsed > (init_duration / 1000)
+            return self.position_tmst > since and elapsed_ns > init_duration * 1_000_000
+        return elapsed_ns > init_duration * 1_000_000
 
     def is_correct(self) -> bool:
         """
@@ -291,7 +447,8 @@ class OpenField(Behavior, dj.Manual):
             True if the response location is correct, False otherwise.
         """
         if self.response_loc is not None:
-            correct_loc = self.response_loc in self.reward_locs
+            rx, ry = self.response_loc
+            correct_loc = (round(rx, 6), round(ry, 6)) in self._reward_locs_set
             if correct_loc:
                 self.log_loc_activity(1, self.response_loc)
             return correct_loc
@@ -321,7 +478,7 @@ class OpenField(Behavior, dj.Manual):
 
     def screen_pos_to_real_pos(
         self, pos: Union[float, List[float]], const_dim: float
-    ) -> List[Tuple[float, float]]:
+    ) -> np.ndarray:
         """
         Convert screen positions to real coordinates.
 
@@ -330,48 +487,37 @@ class OpenField(Behavior, dj.Manual):
             const_dim: The constant dimension (screen width).
 
         Returns:
-            A list of tuples representing the real positions.
+            An (N, 2) float64 array of the real (x, y) positions.
         """
-        screen_pos = self.screen_pos
-        # in a square positions of the screen only one dimension is change
-        diff_screen_pos = screen_pos[0, :] - screen_pos[1, :]
-        dim_change = np.where(diff_screen_pos != 0)[0][0]
-
+        # the screen geometry is fixed, so only the affine map runs per call
         real_pos = (
-            (-1 if diff_screen_pos[dim_change] >= 0 else 1) * np.array(pos) + 0.5
+            self._sign * np.atleast_1d(np.asarray(pos, dtype=np.float64)) + 0.5
         ) * const_dim
+        fixed_pos = np.full_like(real_pos, self._fixed_coord)
 
-        # Ensure real_pos is always a list
-        real_pos = [real_pos] if isinstance(real_pos, float) else real_pos
-
-        locs = [
-            (
-                list(np.array([screen_pos[0, 0], rl_pos]))
-                if dim_change == 1
-                else list(np.array([rl_pos, screen_pos[0, 1]]))
-            )
-            for rl_pos in real_pos
-        ]
-
-        return locs
+        if self._dim_change == 1:
+            return np.column_stack((fixed_pos, real_pos))
+        return np.column_stack((real_pos, fixed_pos))
 
     def get_corners(self):
-        corners_dict: Dict = self.manager.dict()
-        dlc_corners_path = self.logger.get(schema='interface',
-                                           table='SetupConfigurationArena.Models',
-                                           fields=['path'],
-                                           key={'setup_conf_idx': self.exp.session_params['setup_conf_idx'],
-                                                'target': 'corners'})[0]
-        dlcCorners = DLCCornerDetector(frame_queue=self.interface.camera.process_queue,
-                                       model_path=dlc_corners_path,
-                                       arena_size=self.arena_size,
-                                       result=corners_dict,
-                                       logger=self.logger)
-        # wait 60 secs to find the corners
-        dlcCorners.dlc_process.join(timeout=60)
-        if dlcCorners.dlc_process.is_alive():
-            raise Exception("Cannot find DLC corners!!")
-        dlcCorners.dlc_process.close()
+        dlc_corners_path = self._arena_conf["models"]["corners"]
+        # the shared block only lives until the corners are copied out
+        corners_result = _SharedCorners()
+        try:
+            dlcCorners = DLCCornerDetector(frame_queue=self.interface.camera.process_queue,
+                                           model_path=dlc_corners_path,
+                                           arena_size=self.arena_size,
+                                           result=corners_result,
+                                           logger=self.logger)
+            # wait 60 secs to find the corners
+            dlcCorners.dlc_process.join(timeout=60)
+            if dlcCorners.dlc_process.is_alive() or not corners_result.ready.is_set():
+                raise Exception("Cannot find DLC corners!!")
+            dlcCorners.dlc_process.close()
+            corners = corners_result["corners"]
+            affine_matrix = corners_result["affine_matrix"]
+        finally:
+            corners_result.release()
 
         # save the corners in table ConfigurationArena.Corners
         key = self.logger.get(table='ConfigurationArena',
@@ -382,12 +528,12 @@ class OpenField(Behavior, dj.Manual):
             schema='interface',
             table="ConfigurationArena.Corners",
             tuple={
-                "affine_matrix": corners_dict["affine_matrix"],
-                "corners": corners_dict["corners"],
+                "affine_matrix": affine_matrix,
+                "corners": corners,
                 **key},
             priority=5,
         )
-        return corners_dict["corners"], corners_dict["affine_matrix"]
+        return corners, affine_matrix
 
     def stop(self):
         """Stop the camera recording"""
@@ -73,6 +73,17 @@ class Experiment(State, ExperimentClass):
         self.resp_ready = False
         self.state_timer.start()
 
+    def idle(self, timeout=1.0):
+        """
+        Wait up to timeout seconds, returning early on logger shutdown or a setup status change
+        """
+        status = self.logger.setup_status
+        deadline = time.monotonic() + timeout
+        # the setup status is synced by the logger thread, so check it in short slices
+        while not self.logger.thread_end.wait(min(0.1, max(deadline - time.monotonic(), 0))):
+            if self.logger.setup_status != status or time.monotonic() >= deadline:
+                return
+
 
 class Entry(Experiment):
     def entry(self):
@@ -97,7 +108,7 @@ class PreTrial(Experiment):
         elif self.beh.is_sleep_time():
             return "Offtime"
         elif self.beh.in_location(
-            self.beh.init_loc,
+            self.beh.init_loc_np,
             self.curr_cond["init_ready"],
             self.curr_cond["init_radius"],
         ):
@@ -115,7 +126,7 @@ class Trial(Experiment):
         self.stim.present()
         # check if animal is in any response location
         self.response = self.beh.in_location(
-            self.beh.response_locs,
+            self.beh.response_locs_np,
             self.curr_cond["trial_ready"],
             self.curr_cond["radius"],
         )
@@ -141,9 +152,10 @@ class Abort(Experiment):
         super().entry()
         self.beh.update_history()
         self.logger.log("Trial.Aborted")
+        self.abort_period = self.curr_cond["abort_duration"]
 
     def next(self):
-        if self.state_timer.elapsed_time() >= self.curr_cond["abort_duration"]:
+        if self.state_timer.elapsed_time() >= self.abort_period:
             return "InterTrial"
         elif self.is_stopped():
             return "Exit"
@@ -155,6 +167,7 @@ class Reward(Experiment):
     def entry(self):
         super().entry()
         self.stim.reward_stim()
+        self.reward_period = self.curr_cond["reward_duration"]
 
     def run(self):
         self.rewarded = self.beh.reward(self.start_time)
@@ -162,7 +175,7 @@ class Reward(Experiment):
     def next(self):
         if self.rewarded:
             return "InterTrial"
-        elif self.state_timer.elapsed_time() >= self.curr_cond["reward_duration"]:
+        elif self.state_timer.elapsed_time() >= self.reward_period:
             self.beh.update_history(reward=0)
             return "InterTrial"
         elif self.is_stopped():
@@ -195,6 +208,10 @@ class Punish(Experiment):
 
 
 class InterTrial(Experiment):
+    def entry(self):
+        super().entry()
+        self.intertrial_period = self.curr_cond["intertrial_duration"]
+
     def run(self):
         if self.beh.is_licking() and self.curr_cond["noresponse_intertrial"]:
             self.state_timer.start()
@@ -202,13 +219,13 @@ class InterTrial(Experiment):
     def next(self):
         if self.is_stopped():
             return "Exit"
-        elif self.beh.is_sleep_time() and not self.beh.is_hydrated(
-            self.session_params["min_reward"]
-        ):
+        # evaluate the sleep schedule once per tick
+        sleep_time = self.beh.is_sleep_time()
+        if sleep_time and not self.beh.is_hydrated(self.session_params["min_reward"]):
             return 'Hydrate'
-        elif self.beh.is_sleep_time() or self.beh.is_hydrated():
+        elif sleep_time or self.beh.is_hydrated():
             return 'Offtime'
-        elif self.state_timer.elapsed_time() >= self.curr_cond["intertrial_duration"]:
+        elif self.state_timer.elapsed_time() >= self.intertrial_period:
             return "PreTrial"
         else:
             return "InterTrial"
@@ -222,7 +239,7 @@ class Hydrate(Experiment):
         if self.beh.get_response() and self.state_timer.elapsed_time() > self.params['hydrate_delay']*60*1000:
             self.stim.ready_stim()
             self.beh.reward()
-            time.sleep(1)
+            self.idle(1)
 
     def next(self):
         if self.is_stopped():  # if wake up then update session
@@ -243,16 +260,19 @@ class Offtime(Experiment):
     def run(self):
         if self.logger.setup_status != 'sleeping' and self.beh.is_sleep_time():
             self.logger.update_setup_info({'status': 'sleeping'})
-        time.sleep(1)
+        self.idle(1)
 
     def next(self):
         if self.is_stopped():  # if wake up then update session
             return 'Exit'
-        elif self.logger.setup_status == 'wakeup' and not self.beh.is_sleep_time():
+        # evaluate the sleep schedule and setup status once per tick
+        sleep_time = self.beh.is_sleep_time()
+        setup_status = self.logger.setup_status
+        if setup_status == 'wakeup' and not sleep_time:
             return 'PreTrial'
-        elif self.logger.setup_status == 'sleeping' and not self.beh.is_sleep_time():
+        elif setup_status == 'sleeping' and not sleep_time:
             return 'Exit'
-        elif not self.beh.is_hydrated() and not self.beh.is_sleep_time():
+        elif not sleep_time and not self.beh.is_hydrated():
             return 'Exit'
         else:
             return 'Offtime'
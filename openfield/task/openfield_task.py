@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import numpy as np
 from scipy import interpolate
 
@@ -6,22 +8,27 @@ from ethopy.experiments.approach import Experiment
 from ethopy.stimuli.panda import Panda
 
 
+@lru_cache(maxsize=None)
+def _interp_grid(n):
+    """Returns the sample and output grids for an input of length n."""
+    return np.linspace(0, n, n), np.linspace(0, n, 100)
+
+
 def interp(x):
     """
     Interpolates the input array `x` using a B-spline if its length is greater than 3.
     Returns a smooth array of 100 points. If `x` has 3 or fewer elements, returns `x` unchanged.
 
     Parameters:
-        x (array-like): Input data to interpolate.
+        x (array-like): Input data to interpolate. A 2-D input holds one curve per
+            column and all of them are interpolated in a single call.
 
     Returns:
         np.ndarray or array-like: Interpolated array of 100 points, or the original array if length <= 3.
     """
     if len(x) > 3:
-        return interpolate.splev(
-            np.linspace(0, len(x), 100),
-            interpolate.splrep(np.linspace(0, len(x), len(x)), x),
-        )
+        x_old, x_new = _interp_grid(len(x))
+        return interpolate.make_interp_spline(x_old, x, k=3, axis=0)(x_new)
     else:
         return x
 
@@ -38,12 +45,14 @@ session_params = {
 exp = Experiment()
 exp.setup(logger, OpenField, session_params)
 conditions = []
-rot_f = lambda: interp((np.random.rand(30) - 0.5) * 10)
-
 objs_idx = [(3, 8), (3, 8)]
 
 objs_pos = [(-0.4, 0.4), (0.4, -0.4)]
 
+# two random rotation curves per condition, interpolated together in one call;
+# rots holds one contiguous 100-point curve per row
+rots = np.ascontiguousarray(interp(((np.random.rand(2 * len(objs_idx), 30) - 0.5) * 10).T).T)
+
 panda_obj = Panda()
 panda_obj.fill_colors.set(
     {
@@ -54,38 +63,45 @@ panda_obj.fill_colors.set(
     }
 )
 
-for idx, loc in enumerate(objs_idx):
+# parameters shared by all conditions
+base_conditions = {
+    # stimulus parameters
+    "obj_dur": 240000,
+    "obj_mag": 0.4,
+    "obj_tilt": 0,
+    "obj_yaw": 0,
+    "fun": 3,
+    # experiment parameters
+    "trial_duration": 15000,
+    "intertrial_duration": 1000,
+    "reward_duration": 10000,
+    # Behaviour parameters
+    "response_ready": 100,
+    "init_loc_x": 85,
+    "init_loc_y": 110,
+    "init_ready": 0,
+    "trial_ready": 250,
+    "radius": 50,
+    "init_radius": 50,
+    "reward_amount": 6,
+    "response_port": 1,
+    "reward_port": 1,
+}
+
+# make_conditions crosses stimulus and behavior values, so each object keeps
+# its own call to pair its position with its reward location
+for idx, (obj_id, obj_pos) in enumerate(zip(objs_idx, objs_pos)):
     conditions += exp.make_conditions(
         stim_class=panda_obj,
         conditions={
-            # stimulus parameters
-            "obj_id": objs_idx[idx],
-            "obj_dur": 240000,
-            "obj_pos_x": objs_pos[idx],
-            "obj_mag": 0.4,
-            "obj_rot": (rot_f(), rot_f()),
-            "obj_tilt": 0,
-            "obj_yaw": 0,
-            "fun": 3,
-            # experiment parameters
-            "trial_duration": 15000,
-            "intertrial_duration": 1000,
-            "reward_duration": 10000,
-            # Behaviour parameters
-            "reward_loc_x": objs_pos[idx][0],
-            "reward_loc_y": objs_pos[idx][0],
-            "response_loc_x": objs_pos[idx],
-            "response_loc_y": objs_pos[idx],
-            "response_ready": 100,
-            "init_loc_x": 85,
-            "init_loc_y": 110,
-            "init_ready": 0,
-            "trial_ready": 250,
-            "radius": 50,
-            "init_radius": 50,
-            "reward_amount": 6,
-            "response_port": 1,
-            "reward_port": 1,
+            **base_conditions,
+            "obj_id": obj_id,
+            "obj_pos_x": obj_pos,
+            "obj_rot": (rots[2 * idx], rots[2 * idx + 1]),
+            "reward_loc_x": obj_pos[0],
+            "reward_loc_y": obj_pos[0],
+            "response_loc_x": obj_pos,
+            "response_loc_y": obj_pos,
         },
     )
 
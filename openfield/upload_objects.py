@@ -9,7 +9,12 @@ from ethopy.core.logger import stimulus
 def list_files(folder_path: str = "objs", file_extension: str = ".egg") -> list:
     """Returns a list of file_extension filenames in the specified folder."""
     try:
-        return [f for f in os.listdir(folder_path) if f.endswith(".egg")]
+        with os.scandir(folder_path) as entries:
+            return sorted(
+                entry.name
+                for entry in entries
+                if entry.name.endswith(file_extension) and entry.is_file()
+            )
     except FileNotFoundError:
         print("Error: Folder not found.")
         return []
@@ -18,15 +23,44 @@ def list_files(folder_path: str = "objs", file_extension: str = ".egg") -> list:
         return []
 
 
-def store(obj_id, file_path, file_name, description=""):
-    """Uploads an object to the stimulus database."""
-    tuple = dict(
+def read_object(file):
+    """Returns a read-only int8 view of the file without loading it into memory."""
+    if os.path.getsize(file) == 0:
+        return np.zeros(0, dtype=np.int8)
+    return np.memmap(file, dtype=np.int8, mode="r")
+
+
+def object_tuple(obj_id, file_path, file_name, description=""):
+    """Returns the Objects tuple of a file."""
+    return dict(
         obj_id=obj_id,
         description=description,
-        object=np.fromfile(file_path + "/" + file_name, dtype=np.int8),
+        object=read_object(os.path.join(file_path, file_name)),
         file_name=file_name,
     )
-    stimulus.Objects.insert1(tuple)
+
+
+def store(obj_id, file_path, file_name, description=""):
+    """Uploads an object to the stimulus database."""
+    stimulus.Objects.insert1(object_tuple(obj_id, file_path, file_name, description))
+
+
+def store_many(start_obj_id, file_path, file_names):
+    """Uploads the objects with consecutive obj_ids, one file per insert.
+
+    DataJoint packs each blob into memory before sending it, so inserting the
+    files one at a time keeps only one of them in memory; run it inside a
+    transaction to keep the upload all-or-nothing.
+    """
+    for i, file_name in enumerate(file_names):
+        store(start_obj_id + i, file_path, file_name)
+
+
+def get_max_obj_id():
+    """Returns the largest obj_id in the Objects table, 0 if it is empty."""
+    # fetch only the largest obj_id instead of the whole column
+    obj_ids = stimulus.Objects.fetch("obj_id", order_by="obj_id DESC", limit=1)
+    return int(obj_ids[0]) if len(obj_ids) else 0
 
 
 def table_exist(table_name, schema=stimulus):
@@ -47,12 +81,14 @@ if __name__ == "__main__":
     egg_files = list_files(folder_path)
     print(egg_files)
 
-    obj_ids = stimulus.Objects.fetch("obj_id")
-    if len(obj_ids) == 0:
-        max_obj_id = 0
-    else:
-        max_obj_id = max(obj_ids)
-        print(f"Max obj_id: {max_obj_id}")
+    if not egg_files:
+        sys.exit(0)
 
-    for i, file in enumerate(egg_files):
-        store(max_obj_id + 1 + i, folder_path, file)
+    # obj_ids and the upload are taken in one transaction: all files are
+    # stored with consecutive ids or none is. The max read does not lock, so
+    # a concurrent upload that picked the same ids fails on a duplicate key
+    # and rolls back without storing anything
+    with stimulus.Objects().connection.transaction:
+        max_obj_id = get_max_obj_id()
+        print(f"Max obj_id: {max_obj_id}")
+        store_many(max_obj_id + 1, folder_path, egg_files)
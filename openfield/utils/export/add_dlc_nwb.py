@@ -2,9 +2,6 @@
 
 import h5py
 import numpy as np
-from ndx_pose import PoseEstimation, PoseEstimationSeries, Skeleton, Skeletons
-from pynwb import NWBHDF5IO, TimeSeries
-from pynwb.file import Subject
 
 # ============================================================================
 # USER CONFIGURATION - MODIFY THESE PARAMETERS FOR YOUR EXPERIMENT
@@ -47,6 +44,9 @@ CONFIG = {
     "dlc_scorer": "DLC_Openfield_ratbox_resnet_50_iteration-3_shuffle-1",
     "dlc_software": "DeepLabCut",
     "dlc_version": "2.x",
+    # Storage options for the written arrays
+    "compression": "gzip",  # None to write uncompressed
+    "compression_opts": 4,
     # Data processing options
     "convert_timestamps_from_ms": True,  # False if timestamps are already in seconds
     "timestamp_threshold": 10000,  # Values above this are considered milliseconds
@@ -72,6 +72,21 @@ CONFIG = {
 # ============================================================================
 
 
+def _compressed(data, config):
+    """Wrap an array so it is written chunked and compressed."""
+    if not config.get("compression"):
+        return data
+    from pynwb import H5DataIO
+
+    return H5DataIO(
+        data=data,
+        compression=config["compression"],
+        compression_opts=config.get("compression_opts"),
+        shuffle=True,
+        chunks=True,
+    )
+
+
 def add_dlc_data_ndx_pose(config=None):
     """Add DLC data using proper ndx-pose structure based on the examples.
 
@@ -80,6 +95,11 @@ def add_dlc_data_ndx_pose(config=None):
     config : dict, optional
         Configuration dictionary. If None, uses the global CONFIG.
     """
+    # pynwb and ndx-pose are heavy; load them only when converting
+    from ndx_pose import PoseEstimation, PoseEstimationSeries, Skeleton, Skeletons
+    from pynwb import NWBHDF5IO, TimeSeries
+    from pynwb.file import Subject
+
     if config is None:
         config = CONFIG
 
@@ -87,24 +107,34 @@ def add_dlc_data_ndx_pose(config=None):
     print(f"Input file: {config['dlc_h5_file']}")
     print(f"Output file: {config['nwb_file']}")
 
-    # Read DLC data
+    # Read only the DLC fields that are exported instead of the whole records
+    raw_fields = ["timestamp"] + [
+        f"{bodypart}_{suffix}"
+        for bodypart in config["bodyparts"]
+        for suffix in ("x", "y", "score")
+    ]
+    processed_fields = ["timestamp", "head_x", "head_y", "angle"]
     with h5py.File(config["dlc_h5_file"], "r") as f:
-        dlc_raw = f["dlc"][:]
-        dlc_processed = f["dlc_processed"][:]
+        dlc_raw = f["dlc"].fields(raw_fields)[:]
+        dlc_processed = f["dlc_processed"].fields(processed_fields)[:]
 
     print(f"Loaded DLC data: {dlc_raw.shape[0]} frames")
 
-    # Extract timestamps
+    # Extract timestamps (flatten copies, so they can be converted in place)
     timestamps_raw = dlc_raw["timestamp"].flatten()
     timestamps_processed = dlc_processed["timestamp"].flatten()
 
-    # Convert timestamps to seconds if needed
+    # Convert timestamps to seconds if needed; timestamps are monotonic, so
+    # the last one is the max
     if (
         config["convert_timestamps_from_ms"]
-        and timestamps_raw.max() > config["timestamp_threshold"]
+        and timestamps_raw.size
+        and timestamps_raw[-1] > config["timestamp_threshold"]
     ):
-        timestamps_raw = timestamps_raw / 1000.0
-        timestamps_processed = timestamps_processed / 1000.0
+        timestamps_raw = timestamps_raw.astype(np.float64, copy=False)
+        timestamps_processed = timestamps_processed.astype(np.float64, copy=False)
+        np.divide(timestamps_raw, 1000.0, out=timestamps_raw)
+        np.divide(timestamps_processed, 1000.0, out=timestamps_processed)
         print("Converted timestamps from milliseconds to seconds")
 
     with NWBHDF5IO(config["nwb_file"], "r+") as io:
@@ -142,48 +172,44 @@ def add_dlc_data_ndx_pose(config=None):
             )
             print(f"Created camera device: {config['camera_name']}")
 
-        # Create individual PoseEstimationSeries for each bodypart
-        pose_estimation_series = []
-
-        # Create the first bodypart with timestamps, others will reference it
-        first_bodypart = config["bodyparts"][0]
-        x_data = dlc_raw[f"{first_bodypart}_x"].flatten()
-        y_data = dlc_raw[f"{first_bodypart}_y"].flatten()
-        confidence_data = dlc_raw[f"{first_bodypart}_score"].flatten()
-
-        # Combine x,y coordinates for this bodypart
-        bodypart_data = np.column_stack([x_data, y_data])
-
-        first_series = PoseEstimationSeries(
-            name=first_bodypart,
-            description=f"DLC estimated position of {first_bodypart}",
-            data=bodypart_data,
+        # Gather all bodyparts into one (bodyparts, frames, 2) buffer so each
+        # series gets a contiguous view instead of its own column_stack copy
+        bodyparts = config["bodyparts"]
+        n_frames = dlc_raw.shape[0]
+        coord_dtype = dlc_raw.dtype[f"{bodyparts[0]}_x"].base
+        xy = np.empty((len(bodyparts), n_frames, 2), dtype=coord_dtype)
+        confidence = np.empty(
+            (len(bodyparts), n_frames), dtype=dlc_raw.dtype[f"{bodyparts[0]}_score"].base
+        )
+        for i, bodypart in enumerate(bodyparts):
+            xy[i, :, 0] = dlc_raw[f"{bodypart}_x"].reshape(-1)
+            xy[i, :, 1] = dlc_raw[f"{bodypart}_y"].reshape(-1)
+            confidence[i] = dlc_raw[f"{bodypart}_score"].reshape(-1)
+
+        # Create individual PoseEstimationSeries for each bodypart; only the
+        # first series has timestamps, the others reference it
+        common_kwargs = dict(
             unit="pixels",
             reference_frame=config["reference_frame"],
-            timestamps=timestamps_raw,  # Only first series has timestamps
-            confidence=confidence_data,
             confidence_definition=config["confidence_definition"],
         )
-        pose_estimation_series.append(first_series)
-
-        # Create remaining bodyparts (referencing first series for timestamps)
-        for bodypart in config["bodyparts"][1:]:
-            x_data = dlc_raw[f"{bodypart}_x"].flatten()
-            y_data = dlc_raw[f"{bodypart}_y"].flatten()
-            confidence_data = dlc_raw[f"{bodypart}_score"].flatten()
-
-            bodypart_data = np.column_stack([x_data, y_data])
-
+        pose_estimation_series = []
+        first_series = None
+        for i, bodypart in enumerate(bodyparts):
             series = PoseEstimationSeries(
                 name=bodypart,
                 description=f"DLC estimated position of {bodypart}",
-                data=bodypart_data,
-                unit="pixels",
-                reference_frame=config["reference_frame"],
-                timestamps=first_series,  # Reference first series for timestamps
-                confidence=confidence_data,
-                confidence_definition=config["confidence_definition"],
+                data=_compressed(xy[i], config),
+                timestamps=(
+                    _compressed(timestamps_raw, config)
+                    if first_series is None
+                    else first_series
+                ),
+                confidence=_compressed(confidence[i], config),
+                **common_kwargs,
             )
+            if first_series is None:
+                first_series = series
             pose_estimation_series.append(series)
 
         print(f"Created {len(pose_estimation_series)} pose estimation series")
@@ -210,11 +236,15 @@ def add_dlc_data_ndx_pose(config=None):
         processed_head_series = PoseEstimationSeries(
             name="processed_head",
             description="Processed head position from DLC",
-            data=head_coords,
+            data=_compressed(head_coords, config),
             unit="pixels",
             reference_frame=config["reference_frame"],
-            timestamps=timestamps_processed,
-            confidence=np.ones(len(head_coords)),  # Dummy confidence for processed data
+            timestamps=_compressed(timestamps_processed, config),
+            # Dummy confidence for processed data: a read-only broadcast of one
+            # value instead of a frame-sized array; compresses to almost nothing
+            confidence=_compressed(
+                np.broadcast_to(np.float32(1.0), (len(head_coords),)), config
+            ),
             confidence_definition=config["processed_confidence_definition"],
         )
 
@@ -234,8 +264,8 @@ def add_dlc_data_ndx_pose(config=None):
         orientation_series = TimeSeries(
             name=config["orientation_name"],
             description=config["orientation_description"],
-            data=dlc_processed["angle"].flatten(),
-            timestamps=timestamps_processed,
+            data=_compressed(dlc_processed["angle"].flatten(), config),
+            timestamps=processed_head_series,  # Link instead of writing them twice
             unit=config["orientation_unit"],
         )
 
@@ -248,11 +278,10 @@ def add_dlc_data_ndx_pose(config=None):
         else:
             behavior_module = nwbfile.processing[config["behavior_module_name"]]
 
-        # Add all objects to behavior module
-        behavior_module.add(skeletons)
-        behavior_module.add(pose_estimation)
-        behavior_module.add(pose_estimation_processed)
-        behavior_module.add(orientation_series)
+        # Add all objects to behavior module in one call
+        behavior_module.add(
+            [skeletons, pose_estimation, pose_estimation_processed, orientation_series]
+        )
 
         # Write changes
         io.write(nwbfile)
@@ -281,8 +310,9 @@ def validate_config(config):
         if field not in config:
             raise ValueError(f"Missing required configuration field: {field}")
 
-    if len(config["skeleton_edges"]) > 0:
-        max_index = max(max(edge) for edge in config["skeleton_edges"])
+    edges = np.asarray(config["skeleton_edges"], dtype=np.int32)
+    if edges.size:
+        max_index = edges.max()
         if max_index >= len(config["bodyparts"]):
             raise ValueError(
                 f"Skeleton edge index {max_index} exceeds bodyparts list length"
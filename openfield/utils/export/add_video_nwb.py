@@ -1,19 +1,22 @@
 import h5py
-from pynwb import NWBHDF5IO
-from pynwb.image import ImageSeries
+import numpy as np
 
 
 def add_video_with_structured_timestamps(h5_file, nwb_file, video_path):
-    # Read structured timestamp data
-    with h5py.File(h5_file, "r") as f:
-        timestamps_structured = f["frame_tmst"][:]
+    # pynwb is heavy; load it only when converting
+    from pynwb import NWBHDF5IO
+    from pynwb.image import ImageSeries
 
-        # Extract the timestamp field from structured array
-        timestamps_numeric = timestamps_structured["timestamp"].flatten()
+    # Read only the timestamp field of the structured data; the result is a
+    # fresh plain array, so reshape is a view and it can be converted in place
+    with h5py.File(h5_file, "r") as f:
+        timestamps_numeric = f["frame_tmst"].fields("timestamp")[:].reshape(-1)
 
-        # Convert to seconds if needed
-        if timestamps_numeric.max() > 10000:  # Likely milliseconds
-            timestamps_seconds = timestamps_numeric / 1000.0
+        # Convert to seconds if needed; frame timestamps are monotonic, so the
+        # last one is the max
+        if timestamps_numeric.size and timestamps_numeric[-1] > 10000:  # Likely milliseconds
+            timestamps_seconds = timestamps_numeric.astype(np.float64, copy=False)
+            np.divide(timestamps_seconds, 1000.0, out=timestamps_seconds)
             print(
                 f"Converted {len(timestamps_seconds)} timestamps from milliseconds to seconds"
             )
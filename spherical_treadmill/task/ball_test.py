@@ -1,6 +1,4 @@
 # Navigate on a VR ball
-import numpy as np
-
 from ethopy.experiment.navigate import Experiment
 from ethopy.stimuli.vr_odors import VROdors
 from ethopy.behaviors.vr_ball import VRBall 
@@ -18,7 +16,7 @@ session_params = {
 exp = Experiment()
 exp.setup(logger, VRBall, session_params) 
 
-np.random.seed(0)
+# exp.setup already seeds NumPy's global generator (seed 0) for trial selection
 conditions = []
 
 block = exp.Block(difficulty=0, next_up=0, next_down=0, trial_selection="staircase")
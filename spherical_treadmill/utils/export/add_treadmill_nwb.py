@@ -1,70 +1,94 @@
+import logging
+
 import h5py
 import numpy as np
-from pynwb import NWBHDF5IO, TimeSeries
+from pynwb import H5DataIO, NWBHDF5IO, TimeSeries
 
+log = logging.getLogger(__name__)
 
-def add_tracking_data_simple(tracking_h5_file, nwb_file):
-    """Add treadmill tracking data using simple TimeSeries - avoids extension conflicts."""
 
-    # Read tracking data
-    with h5py.File(tracking_h5_file, "r") as f:
-        tracking_data = f["tracking_data"][:]
+def _compressed(data):
+    """Wrap an array so it is written chunked and gzip compressed."""
+    return H5DataIO(data=data, compression="gzip", compression_opts=4, chunks=True)
 
-    print(f"Tracking data shape: {tracking_data.shape}")
-    print(f"Tracking data dtype: {tracking_data.dtype}")
 
-    # Extract individual components - CORRECTLY handle the 4-field structure
+def add_tracking_data_simple(tracking_h5_file, nwb_file):
+    """Add treadmill tracking data using simple TimeSeries - avoids extension conflicts."""
+
+    # Read tracking data - CORRECTLY handle the 4-field structure
     # The data shape is (23300, 4) but dtype shows it's a structured array
     # Each "row" contains 4 fields: loc_x, loc_y, theta, tmst
-
-    loc_x = tracking_data["loc_x"]  # Don't flatten yet
-    loc_y = tracking_data["loc_y"]
-    theta = tracking_data["theta"]
-    timestamps = tracking_data["tmst"]
-
-    print(f"Before flattening:")
-    print(f"  loc_x shape: {loc_x.shape}")
-    print(f"  timestamps shape: {timestamps.shape}")
+    # Read each field on its own so every column arrives as a plain array; the
+    # larger chunk cache keeps chunks in memory between the field reads
+    with h5py.File(tracking_h5_file, "r", rdcc_nbytes=16 * 1024 * 1024) as f:
+        tracking_data = f["tracking_data"]
+        log.debug("Tracking data shape: %s", tracking_data.shape)
+        log.debug("Tracking data dtype: %s", tracking_data.dtype)
+
+        loc_x = tracking_data.fields("loc_x")[:]  # Don't flatten yet
+        loc_y = tracking_data.fields("loc_y")[:]
+        theta = tracking_data.fields("theta")[:]
+        timestamps = tracking_data.fields("tmst")[:]
+
+    log.debug(
+        "Before flattening: loc_x shape %s, timestamps shape %s",
+        loc_x.shape,
+        timestamps.shape,
+    )
 
     # Now flatten properly - the issue was that we had (23300, 4)
-    # being treated as if each field was expanded
-    if len(loc_x.shape) > 1:
-        loc_x = loc_x.flatten()
-        loc_y = loc_y.flatten()
-        theta = theta.flatten()
-        timestamps = timestamps.flatten()
-
-    print(f"After flattening:")
-    print(f"  loc_x shape: {loc_x.shape}")
-    print(f"  Sample timestamps: {timestamps[:5]}")
-    print(f"  Timestamp range: {timestamps[0]} to {timestamps[-1]}")
+    # being treated as if each field was expanded; the field reads are
+    # contiguous, so ravel returns views and is free for 1-D columns
+    # positions are cumulative and grow large, so they stay double for the
+    # speed computation; only the stored datasets are single precision
+    loc_x = loc_x.ravel().astype(np.float64, copy=False)
+    loc_y = loc_y.ravel().astype(np.float64, copy=False)
+    theta = theta.ravel().astype(np.float32, copy=False)
+    timestamps = timestamps.ravel()
+
+    # formatting array slices is not free, so only do it when it is shown
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("After flattening: loc_x shape %s", loc_x.shape)
+        log.debug("Sample timestamps: %s", timestamps[:5])
+        log.debug("Timestamp range: %s to %s", timestamps[0], timestamps[-1])
 
     # Convert timestamps to seconds if needed
     if np.max(timestamps) > 10000:
-        timestamps = timestamps / 1000.0
-        print("Converted timestamps from milliseconds to seconds")
-        print(f"New range: {timestamps[0]:.3f} to {timestamps[-1]:.3f} seconds")
-
-    # Prepare data
-    position_data = np.column_stack([loc_x, loc_y])
-
-    # Calculate speed
-    dx = np.diff(loc_x)
-    dy = np.diff(loc_y)
-    dt = np.diff(timestamps)
-    dt[dt == 0] = np.finfo(float).eps  # Avoid division by zero
-    speed = np.sqrt(dx**2 + dy**2) / dt
-    speed = np.concatenate([[0], speed])  # Add initial zero
-
-    # Add to NWB file using simple TimeSeries
-    with NWBHDF5IO(nwb_file, "r+") as io:
+        # the field read owns its buffer, so only a non-float64 column is copied
+        timestamps = np.ascontiguousarray(timestamps, dtype=np.float64)
+        timestamps /= 1000.0
+        log.debug(
+            "Converted timestamps from milliseconds to seconds, new range: "
+            "%.3f to %.3f seconds",
+            timestamps[0],
+            timestamps[-1],
+        )
+
+    # Prepare data: fill a C-contiguous float32 (N, 2) array column by column
+    position_data = np.empty((loc_x.size, 2), dtype=np.float32)
+    position_data[:, 0] = loc_x
+    position_data[:, 1] = loc_y
+
+    # Calculate speed from centered differences of the position; the time axis
+    # is rebuilt from clamped steps so repeated timestamps cannot divide by zero
+    dt = np.diff(timestamps).astype(np.float64, copy=False)
+    np.maximum(dt, np.finfo(dt.dtype).eps, out=dt)  # Avoid division by zero
+    t = np.concatenate(([0.0], np.cumsum(dt)))  # only the spacing matters
+    speed = np.empty(len(timestamps), dtype=np.float32)  # float32 only when stored
+    np.hypot(np.gradient(loc_x, t), np.gradient(loc_y, t), out=speed)
+
+    # Add to NWB file using simple TimeSeries; open it with a larger chunk
+    # cache so the new datasets are written in fewer, bigger HDF5 I/Os
+    with h5py.File(
+        nwb_file, "r+", rdcc_nbytes=64 * 1024 * 1024, rdcc_nslots=1_000_003
+    ) as h5_file, NWBHDF5IO(file=h5_file, mode="r+") as io:
         nwbfile = io.read()
 
         # Create TimeSeries for position (avoid SpatialSeries to prevent conflicts)
         position_ts = TimeSeries(
             name="treadmill_position_xy",
             description="treadmill tracking position (x, y coordinates)",
-            data=position_data,
+            data=_compressed(position_data),
             timestamps=timestamps,
             unit="units",  # Replace with your actual units
             comments="Columns: loc_x, loc_y from treadmill tracking system",
@@ -74,8 +98,8 @@ def add_tracking_data_simple(tracking_h5_file, nwb_file):
         orientation_ts = TimeSeries(
             name="treadmill_orientation_theta",
             description="Animal orientation angle on treadmill",
-            data=theta,
-            timestamps=timestamps,
+            data=_compressed(theta),
+            timestamps=position_ts,  # Link instead of writing them again
             unit="radians",
             comments="Theta angle from treadmill tracking system",
         )
@@ -84,8 +108,8 @@ def add_tracking_data_simple(tracking_h5_file, nwb_file):
         speed_ts = TimeSeries(
             name="treadmill_movement_speed",
             description="Instantaneous movement speed on treadmill",
-            data=speed,
-            timestamps=timestamps,
+            data=_compressed(speed),
+            timestamps=position_ts,
             unit="units/second",
             comments="Calculated from position derivatives",
         )
@@ -98,17 +122,16 @@ def add_tracking_data_simple(tracking_h5_file, nwb_file):
         else:
             behavior_module = nwbfile.processing["behavior"]
 
-        # Add all tracking data as simple TimeSeries
-        behavior_module.add(position_ts)
-        behavior_module.add(orientation_ts)
-        behavior_module.add(speed_ts)
+        # Add all tracking data as simple TimeSeries in one call
+        behavior_module.add([position_ts, orientation_ts, speed_ts])
 
         io.write(nwbfile)
 
+    duration = float(timestamps[-1]) - float(timestamps[0])
     print("✅ Treadmill tracking data added successfully!")
     print(f"   Position data: {len(timestamps)} timepoints")
-    print(f"   Duration: {timestamps[-1] - timestamps[0]:.2f} seconds")
-    print(f"   Average speed: {speed.mean():.3f} units/second")
+    print(f"   Duration: {duration:.2f} seconds")
+    print(f"   Average speed: {speed.mean(dtype=np.float64):.3f} units/second")
 
     return True
 
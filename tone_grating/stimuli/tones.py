@@ -26,17 +26,30 @@ class Tones(Stimulus, dj.Manual):
                               'reward': (0.6, 0.6, 0.6),
                               'punish': (0, 0, 0)})
 
+    def make_conditions(self, conditions):
+        # reject bad pulse settings before any condition is inserted, so start() does not have to
+        for cond in conditions:
+            cond = {**self.default_key, **cond}
+            tone_pulse_freq = cond.get('tone_pulse_freq')
+            tone_duration = cond.get('tone_duration')
+            # missing fields are left to the base class's required-field check;
+            # two pulses take 2000/tone_pulse_freq ms and must fit in the tone duration,
+            # a zero pulse frequency means a continuous tone and is not checked
+            if tone_pulse_freq and tone_duration is not None and tone_duration * tone_pulse_freq < 2000:
+                raise ValueError('Tone pulse frequency has to be adjusted for at least 2 clicks per tone duration')
+        return super().make_conditions(conditions)
+
     def start(self):
-        tone_frequency = self.curr_cond['tone_frequency']
-        tone_volume = self.curr_cond['tone_volume']
-        tone_pulse_freq=self.curr_cond['tone_pulse_freq']
-        if (1000/tone_pulse_freq)*2 > tone_volume :
-            raise ValueError('Tone pulse frequency has to be adjusted for at least 2 clicks per tone duration')
-        self.exp.interface.give_sound(tone_frequency, tone_volume, tone_pulse_freq)
+        curr_cond = self.curr_cond
+        self.exp.interface.give_sound(curr_cond['tone_frequency'],
+                                      curr_cond['tone_volume'],
+                                      curr_cond['tone_pulse_freq'])
         super().start()
+        # stop time on the timer's clock (seconds), checked on every present
+        self.tone_deadline = self.timer.start_time + curr_cond['tone_duration'] / 1000
 
     def present(self):
-        if self.timer.elapsed_time() > self.curr_cond['tone_duration'] and self.in_operation:
+        if self.in_operation and self.timer.time() > self.tone_deadline:
             self.in_operation = False
             self.stop()
 
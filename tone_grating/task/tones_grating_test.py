@@ -81,7 +81,7 @@ conditions = []  # Initialize an empty list to hold all trial dictionaries
 stim_instance = TonesGrating()
 block=exp.Block(difficulty=1, next_down=1, next_up=2)
 for idx, port in enumerate(ports):
-    conditions += exp.make_conditions(stim_class=TonesGrating(), conditions={**block.dict(),
+    conditions += exp.make_conditions(stim_class=stim_instance, conditions={**block.dict(),
                                                                         **all_conditions,
                                                                         'theta'        : theta[idx],
                                                                         'tone_pulse_freq': tn_freq[idx],
@@ -91,7 +91,7 @@ for idx, port in enumerate(ports):
                                                                         'response_port': port})
 block=exp.Block(difficulty=2, next_down=2, next_up=1)
 for idx, port in enumerate(ports):
-    conditions += exp.make_conditions(stim_class=TonesGrating(), conditions={**block.dict(),
+    conditions += exp.make_conditions(stim_class=stim_instance, conditions={**block.dict(),
                                                                         **all_conditions,
                                                                         'theta'        : theta[idx],
                                                                         'tone_pulse_freq': tn_freq[idx],
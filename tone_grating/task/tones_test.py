@@ -72,13 +72,16 @@ tn_freq  = [0, 100]
 # --- Generate the List of Trial Conditions ---
 conditions = []  # Initialize an empty list to hold all trial dictionaries
 block=exp.Block(difficulty=1, next_down=1, next_up=1)
-for idx, port in enumerate(ports):
-    conditions += exp.make_conditions(stim_class=Tones(), conditions={**block.dict(),
-                                                                        **all_conditions,
-                                                                        'tone_pulse_freq': tn_freq[idx],
-                                                                        'tone_volume'     : 0,  
-                                                                        'reward_port'  : port,
-                                                                        'response_port': port})
+# make_conditions crosses stimulus and behavior values, so each tone/port pair
+# gets its own call; the stimulus instance is shared between them
+tones = Tones()
+for port, freq in zip(ports, tn_freq):
+    conditions += exp.make_conditions(stim_class=tones, conditions={**block.dict(),
+                                                                      **all_conditions,
+                                                                      'tone_pulse_freq': freq,
+                                                                      'tone_volume'     : 0,
+                                                                      'reward_port'  : port,
+                                                                      'response_port': port})
 
 # --- Push Conditions and Start Experiment ---
 exp.push_conditions(conditions)  # Load the trial sequence into the experiment